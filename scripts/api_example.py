@@ -1,3 +1,5 @@
+import torch
+
 from remora.data_chunks import RemoraRead
 from remora.model_util import load_model
 
@@ -5,5 +7,9 @@ from remora.model_util import load_model
 from remora.inference import call_read_mods
 
 read = RemoraRead.test_read()
-model, model_metadata = load_model("remora_train_results/model_final.pt")
+# run the model on the first GPU when available
+model, model_metadata = load_model(
+    "remora_train_results/model_final.pt",
+    device=0 if torch.cuda.is_available() else None,
+)
 preds, labels, pos = call_read_mods(read, model, model_metadata)
@@ -10,6 +10,9 @@ DEFAULT_EPOCHS = 50
 DEFAULT_WEIGHT_DECAY = 1e-4
 DEFAULT_FILT_FRAC = 0.1
 DEFAULT_LR = 0.001
+DEFAULT_PREFETCH_BATCHES = 4
+# minutes to wait for other processes, e.g. during validation on rank 0
+DEFAULT_DIST_TIMEOUT = 60
 
 DEFAULT_SCHEDULER = "StepLR"
 DEFAULT_SCH_VALUES = {"step_size": 10, "gamma": 0.6}
@@ -510,18 +510,19 @@ class RemoraRead:
         """
         device = next(model.parameters()).device
         read_outputs, read_poss, read_labels = [], [], []
-        for sigs, enc_kmers, labels, read_pos in self.batches:
-            read_outputs.append(
-                model.forward(
-                    sigs=torch.from_numpy(sigs).to(device),
-                    seqs=torch.from_numpy(enc_kmers).to(device),
+        # inference mode skips recording the autograd graph for each call
+        with torch.inference_mode():
+            for sigs, enc_kmers, labels, read_pos in self.batches:
+                read_outputs.append(
+                    model.forward(
+                        sigs=torch.from_numpy(sigs).to(device),
+                        seqs=torch.from_numpy(enc_kmers).to(device),
+                    )
+                    .cpu()
+                    .numpy()
                 )
-                .detach()
-                .cpu()
-                .numpy()
-            )
-            read_labels.append(labels)
-            read_poss.append(read_pos)
+                read_labels.append(labels)
+                read_poss.append(read_pos)
         read_outputs = np.concatenate(read_outputs, axis=0)
         read_labels = np.concatenate(read_labels)
         read_poss = np.concatenate(read_poss)
@@ -1141,6 +1142,45 @@ class RemoraDataset:
             sig_map_refiner=self.sig_map_refiner,
         )
 
+    def shard(self, rank, world_size, seed=None):
+        """Select the subset of chunks to be processed by one of world_size
+        distributed training processes. Each shard contains the same number of
+        chunks so that all processes step through the same number of batches.
+
+        If seed is provided, chunks are assigned to shards from a random
+        permutation. All processes must pass the same seed so that shards are
+        disjoint. Vary the seed by epoch to draw new shards each epoch.
+        """
+        shard_size = self.nchunks // world_size
+        if shard_size == 0:
+            raise RemoraError("Too few chunks to shard across processes")
+        if seed is None:
+            indices = np.arange(rank, shard_size * world_size, world_size)
+        else:
+            perm = np.random.default_rng(seed).permutation(self.nchunks)
+            indices = perm[rank : shard_size * world_size : world_size]
+        return RemoraDataset(
+            self.sig_tensor[indices],
+            self.seq_array[indices],
+            self.seq_mappings[indices],
+            self.seq_lens[indices],
+            self.labels[indices],
+            self.read_ids[indices],
+            self.read_focus_bases[indices],
+            shuffle_on_iter=self.shuffle_on_iter,
+            drop_last=self.drop_last,
+            balanced_batch=self.balanced_batch,
+            chunk_context=self.chunk_context,
+            max_seq_len=self.max_seq_len,
+            kmer_context_bases=self.kmer_context_bases,
+            base_pred=self.base_pred,
+            mod_bases=self.mod_bases,
+            mod_long_names=self.mod_long_names,
+            motifs=self.motifs,
+            batch_size=self.batch_size,
+            sig_map_refiner=self.sig_map_refiner,
+        )
+
     def add_fake_base(self, new_mod_long_names, new_mod_bases):
         if not set(self.mod_long_names).issubset(new_mod_long_names):
             raise RemoraError(
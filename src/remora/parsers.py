@@ -38,6 +38,20 @@ class SubcommandHelpFormatter(
         return parts
 
 
+def positive_int(value):
+    int_value = int(value)
+    if int_value < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not positive")
+    return int_value
+
+
+def non_negative_int(value):
+    int_value = int(value)
+    if int_value < 0:
+        raise argparse.ArgumentTypeError(f"{value} is negative")
+    return int_value
+
+
 ##################
 # remora dataset #
 ##################
@@ -591,6 +605,13 @@ def register_model_train(parser):
         default=None,
         metavar=("NAME", "VALUE", "TYPE"),
     )
+    train_grp.add_argument(
+        "--accum-steps",
+        default=1,
+        type=positive_int,
+        help="Number of batches over which to accumulate gradients before "
+        "each optimizer step. Default: %(default)d",
+    )
     train_grp.add_argument(
         "--balanced-batch",
         action="store_true",
@@ -601,7 +622,35 @@ def register_model_train(parser):
     comp_grp.add_argument(
         "--device",
         type=int,
-        help="ID of GPU that is used for training. Default: Use CPU.",
+        help="ID of GPU that is used for training. Default: Use CPU. "
+        "Ignored when launched with torchrun for distributed training.",
+    )
+    comp_grp.add_argument(
+        "--prefetch-batches",
+        type=non_negative_int,
+        default=constants.DEFAULT_PREFETCH_BATCHES,
+        help="Number of training batches to prepare in a background thread "
+        "while the model trains. Set to 0 to disable. Default: %(default)d",
+    )
+    comp_grp.add_argument(
+        "--no-cudnn-benchmark",
+        action="store_true",
+        help="Disable cuDNN benchmark mode. Benchmark mode selects the "
+        "fastest convolution algorithms, but results may not be reproducible.",
+    )
+    comp_grp.add_argument(
+        "--no-tf32",
+        action="store_true",
+        help="Disable TensorFloat-32 matmul and convolutions on Ampere and "
+        "newer GPUs for bit-exact float32 results.",
+    )
+    comp_grp.add_argument(
+        "--dist-timeout",
+        type=float,
+        default=constants.DEFAULT_DIST_TIMEOUT,
+        help="Minutes for distributed training processes to wait for each "
+        "other, for example while the main process runs validation. "
+        "Default: %(default)s",
     )
 
     subparser.set_defaults(func=run_model_train)
@@ -611,15 +660,22 @@ def run_model_train(args):
     from remora.train_model import train_model
 
     out_path = Path(args.output_path)
-    if args.overwrite:
-        if out_path.is_dir():
-            rmtree(out_path)
+    # when launched via torchrun only the main process prepares the output
+    # directory and writes the log file
+    if int(os.environ.get("RANK", 0)) == 0:
+        if args.overwrite:
+            if out_path.is_dir():
+                rmtree(out_path)
+            elif out_path.exists():
+                out_path.unlink()
         elif out_path.exists():
-            out_path.unlink()
-    elif out_path.exists():
-        raise RemoraError("Refusing to overwrite existing training directory.")
-    out_path.mkdir(parents=True, exist_ok=True)
-    log.init_logger(os.path.join(out_path, "log.txt"))
+            raise RemoraError(
+                "Refusing to overwrite existing training directory."
+            )
+        out_path.mkdir(parents=True, exist_ok=True)
+        log.init_logger(os.path.join(out_path, "log.txt"))
+    else:
+        log.init_logger(quiet=True)
     train_model(
         args.seed,
         args.device,
@@ -643,6 +699,11 @@ def run_model_train(args):
         args.lr_sched_kwargs,
         args.balance,
         args.balanced_batch,
+        args.prefetch_batches,
+        not args.no_cudnn_benchmark,
+        not args.no_tf32,
+        args.accum_steps,
+        args.dist_timeout,
     )
 
 
@@ -1,9 +1,16 @@
 import os
+import queue
 import atexit
+import datetime
 from shutil import copyfile
+from threading import Thread
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
 import numpy as np
+from torch import distributed as dist
+from torch.nn.parallel import DistributedDataParallel as DDP
 from tqdm import tqdm
 from thop import profile
 
@@ -21,9 +28,17 @@ from remora import (
 LOGGER = log.get_logger()
 BREACH_THRESHOLD = 0.8
 REGRESSION_THRESHOLD = 0.7
+# number of batch losses held on device between writes to batch.log
+BATCH_LOSS_BUFFER_SIZE = 100
 
 
 def load_optimizer(optimizer, model, lr, weight_decay, momentum=0.9):
+    # use multi-tensor kernels to update all parameters in few launches. The
+    # single kernel fused Adam implementations require GPU parameters.
+    if next(model.parameters()).is_cuda:
+        adam_kwargs = {"fused": True}
+    else:
+        adam_kwargs = {"foreach": True}
     if optimizer == constants.SGD_OPT:
         return torch.optim.SGD(
             model.parameters(),
@@ -31,22 +46,36 @@ def load_optimizer(optimizer, model, lr, weight_decay, momentum=0.9):
             weight_decay=weight_decay,
             momentum=momentum,
             nesterov=True,
+            foreach=True,
         )
     elif optimizer == constants.ADAM_OPT:
         return torch.optim.Adam(
             model.parameters(),
             lr=lr,
             weight_decay=weight_decay,
+            **adam_kwargs,
         )
     elif optimizer == constants.ADAMW_OPT:
         return torch.optim.AdamW(
             model.parameters(),
             lr=lr,
             weight_decay=weight_decay,
+            **adam_kwargs,
         )
     raise RemoraError(f"Invalid optimizer specified ({optimizer})")
 
 
+def write_batch_losses(batch_fp, losses, first_iter):
+    """Write buffered losses to the batch log. Copying the stacked losses to
+    the host synchronizes with the device once per call instead of once per
+    batch.
+    """
+    losses_np = torch.stack(losses).float().cpu().numpy()
+    for iter_i, loss in enumerate(losses_np, first_iter):
+        batch_fp.write(f"{iter_i}\t{loss:.6f}\n")
+    losses.clear()
+
+
 def select_scheduler(scheduler, opt, lr_sched_kwargs):
     lr_sched_dict = {}
     if lr_sched_kwargs is None and scheduler is None:
@@ -67,7 +96,18 @@ def save_model(
     model_name=constants.BEST_MODEL_FILENAME,
     as_torchscript=True,
     model_name_torchscript=constants.BEST_TORCHSCRIPT_MODEL_FILENAME,
+    executor=None,
 ):
+    """Save model checkpoint and optionally a TorchScript model.
+
+    If executor is provided, model and optimizer states are copied to the CPU
+    and the checkpoint is written in the background. The TorchScript model is
+    always written before returning.
+
+    Returns:
+        Future for the background checkpoint write or None if no executor
+        was provided. Call result on the future to raise any write errors.
+    """
     ckpt_save_data["epoch"] = epoch + 1
     state_dict = model.state_dict()
     if "total_ops" in state_dict.keys():
@@ -76,16 +116,149 @@ def save_model(
         state_dict.pop("total_params", None)
     ckpt_save_data["state_dict"] = state_dict
     ckpt_save_data["opt"] = opt.state_dict()
-    torch.save(
-        ckpt_save_data,
-        os.path.join(out_path, model_name),
-    )
+    ckpt_path = os.path.join(out_path, model_name)
+    ckpt_future = None
+    if executor is None:
+        torch.save(ckpt_save_data, ckpt_path)
+    else:
+        # snapshot states since training continues to update them in place
+        ckpt_future = executor.submit(
+            torch.save, copy_tensors_to_cpu(ckpt_save_data), ckpt_path
+        )
     if as_torchscript:
         model_util.export_model_torchscript(
             ckpt_save_data,
             model,
             os.path.join(out_path, model_name_torchscript),
         )
+    return ckpt_future
+
+
+def copy_tensors_to_cpu(obj):
+    """Copy all tensors contained in (possibly nested) dicts and lists to new
+    CPU tensors. Other values are returned as is.
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {key: copy_tensors_to_cpu(val) for key, val in obj.items()}
+    if isinstance(obj, list):
+        return [copy_tensors_to_cpu(val) for val in obj]
+    return obj
+
+
+class BatchPrefetcher:
+    """Iterate over training batches as torch tensors. When CUDA is
+    available, the next batch is copied to the GPU on a side stream while the
+    current batch is processed on the default stream.
+
+    Args:
+        dataset (RemoraDataset): Dataset producing training batches
+        prefetch_batches (int): Number of batches to prepare ahead of time in
+            a background thread. Set to 0 to prepare batches in the main
+            thread. Errors raised while preparing batches are re-raised from
+            the training loop.
+    """
+
+    def __init__(
+        self, dataset, prefetch_batches=constants.DEFAULT_PREFETCH_BATCHES
+    ):
+        self.dataset = dataset
+        self.prefetch_batches = prefetch_batches
+        self.stream = torch.cuda.Stream() if torch.cuda.is_available() else None
+
+    def _iter_np_batches(self):
+        bb, ab = self.dataset.kmer_context_bases
+        for (sigs, seqs, seq_maps, seq_lens), labels, _ in self.dataset:
+            enc_kmers = encoded_kmers.compute_encoded_kmer_batch(
+                bb, ab, seqs, seq_maps, seq_lens
+            )
+            yield sigs, enc_kmers, labels
+
+    def _iter_host_batches(self):
+        for batch in self._iter_np_batches():
+            batch = tuple(map(torch.from_numpy, batch))
+            if self.stream is not None:
+                # page-locked memory allows asynchronous copies to the GPU
+                batch = tuple(t.pin_memory() for t in batch)
+            yield batch
+
+    def _fill_queue(self, batch_q):
+        try:
+            for batch in self._iter_host_batches():
+                batch_q.put(batch)
+        except Exception as e:
+            # pass errors to the consuming thread to be raised there
+            batch_q.put(e)
+        else:
+            batch_q.put(None)
+
+    def _iter_queue(self):
+        # threads share memory so batches are not pickled between workers
+        batch_q = queue.Queue(maxsize=self.prefetch_batches)
+        Thread(
+            target=self._fill_queue,
+            args=(batch_q,),
+            name="PrefetchBatches",
+            daemon=True,
+        ).start()
+        while True:
+            batch = batch_q.get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+
+    def _load(self, host_batches):
+        try:
+            batch = next(host_batches)
+        except StopIteration:
+            return None
+        if self.stream is None:
+            return batch
+        with torch.cuda.stream(self.stream):
+            return tuple(t.cuda(non_blocking=True) for t in batch)
+
+    def __iter__(self):
+        if self.prefetch_batches > 0:
+            host_batches = self._iter_queue()
+        else:
+            host_batches = self._iter_host_batches()
+        next_batch = self._load(host_batches)
+        while next_batch is not None:
+            if self.stream is not None:
+                curr_stream = torch.cuda.current_stream()
+                curr_stream.wait_stream(self.stream)
+                # tensors were allocated on the side stream
+                for t in next_batch:
+                    t.record_stream(curr_stream)
+            batch = next_batch
+            next_batch = self._load(host_batches)
+            yield batch
+
+
+def init_distributed(timeout=constants.DEFAULT_DIST_TIMEOUT):
+    """Initialize the default process group when launched via torchrun.
+
+    Args:
+        timeout (float): Minutes to wait for other processes in collective
+            operations before aborting.
+
+    Returns:
+        Tuple of rank, local rank and world size. (0, None, 1) when not run
+        as a distributed job.
+    """
+    if "LOCAL_RANK" not in os.environ:
+        return 0, None, 1
+    local_rank = int(os.environ["LOCAL_RANK"])
+    timeout = datetime.timedelta(minutes=timeout)
+    if torch.cuda.is_available():
+        torch.cuda.set_device(local_rank)
+        dist.init_process_group("nccl", timeout=timeout)
+    else:
+        dist.init_process_group("gloo", timeout=timeout)
+    return dist.get_rank(), local_rank, dist.get_world_size()
 
 
 def train_model(
@@ -111,23 +284,51 @@ def train_model(
     lr_sched_kwargs,
     balance,
     balanced_batch,
+    prefetch_batches=constants.DEFAULT_PREFETCH_BATCHES,
+    cudnn_benchmark=True,
+    allow_tf32=True,
+    accum_steps=1,
+    dist_timeout=constants.DEFAULT_DIST_TIMEOUT,
 ):
+    if accum_steps < 1:
+        raise RemoraError("accum_steps must be at least 1")
+    rank, local_rank, world_size = init_distributed(dist_timeout)
+    is_distributed = world_size > 1
+    is_main = rank == 0
     seed = (
         np.random.randint(0, np.iinfo(np.uint32).max, dtype=np.uint32)
         if seed is None
         else seed
     )
+    if is_distributed:
+        # all processes share a seed so that data splits agree
+        seed_list = [int(seed)]
+        dist.broadcast_object_list(seed_list, src=0)
+        seed = seed_list[0]
     LOGGER.info(f"Seed selected is {seed}")
 
+    if is_distributed:
+        LOGGER.info(f"Distributed training with {world_size} processes")
+        if device is not None:
+            LOGGER.warning(
+                "Device option ignored for distributed training. Using "
+                "LOCAL_RANK environment variable."
+            )
+
     np.random.seed(seed)
     torch.manual_seed(seed)
-    if torch.cuda.is_available() and device is not None:
+    if torch.cuda.is_available() and local_rank is not None:
+        torch.cuda.manual_seed_all(seed)
+    elif torch.cuda.is_available() and device is not None:
         torch.cuda.manual_seed_all(seed)
         torch.cuda.set_device(device)
     elif device is not None:
         LOGGER.warning(
             "Device option specified, but CUDA is not available from torch."
         )
+    # TF32 tensor cores are used for float32 matmul/conv on Ampere and newer
+    torch.backends.cuda.matmul.allow_tf32 = allow_tf32
+    torch.backends.cudnn.allow_tf32 = allow_tf32
 
     LOGGER.info("Loading dataset from Remora file")
     dataset = RemoraDataset.load_from_file(
@@ -136,6 +337,11 @@ def train_model(
         balanced_batch=balanced_batch,
     )
     LOGGER.info(f"Dataset loaded with labels: {dataset.get_label_counts()}")
+    if dataset.labels.dtype != np.int64:
+        # cross entropy loss targets must be class indices of type long
+        raise RemoraError(
+            f"Dataset labels must be int64 (found {dataset.labels.dtype})"
+        )
     if balance:
         dataset = dataset.balance_classes()
         LOGGER.info(f"Dataset balanced: {dataset.get_label_counts()}")
@@ -144,16 +350,26 @@ def train_model(
     # load attributes from file
     LOGGER.info(f"Dataset summary:\n{dataset.summary}")
 
-    val_fp = open(out_path / "validation.log", mode="w", buffering=1)
+    # only the main process writes training logs
+    val_fp = open(
+        out_path / "validation.log" if is_main else os.devnull,
+        mode="w",
+        buffering=1,
+    )
     atexit.register(val_fp.close)
     val_fp = validate.ValidationLogger(val_fp)
-    batch_fp = open(out_path / "batch.log", "w", buffering=1)
+    batch_fp = open(
+        out_path / "batch.log" if is_main else os.devnull, "w", buffering=1
+    )
     atexit.register(batch_fp.close)
     batch_fp.write("Iteration\tLoss\n")
 
     LOGGER.info("Loading model")
     copy_model_path = util.resolve_path(os.path.join(out_path, "model.py"))
-    copyfile(model_path, copy_model_path)
+    if is_main:
+        copyfile(model_path, copy_model_path)
+    if is_distributed:
+        dist.barrier()
     num_out = 4 if dataset.base_pred else len(dataset.mod_bases) + 1
     model_params = {
         "size": size,
@@ -193,11 +409,28 @@ def train_model(
     )
 
     LOGGER.info("Preparing training settings")
-    criterion = torch.nn.CrossEntropyLoss()
     if torch.cuda.is_available():
         model = model.cuda()
-        criterion = criterion.cuda()
+        # fixed width chunks allow cuDNN to select the fastest algorithms
+        if cudnn_benchmark and not model._variable_width_possible:
+            torch.backends.cudnn.benchmark = True
+    # train_net wraps model to synchronize gradients across processes. The
+    # unwrapped model is used for validation and saving.
+    train_net = model
+    if is_distributed:
+        train_net = DDP(
+            model,
+            device_ids=[local_rank] if torch.cuda.is_available() else None,
+            bucket_cap_mb=25,
+            gradient_as_bucket_view=True,
+        )
+    # loss has no parameters or buffers so need not be moved to the GPU.
+    # Under autocast cross entropy is computed in float32.
+    criterion = torch.nn.CrossEntropyLoss(reduction="mean", label_smoothing=0)
     opt = load_optimizer(optimizer, model, lr, weight_decay)
+    # mixed precision is only applied when training on a GPU
+    use_amp = torch.cuda.is_available()
+    scaler = torch.amp.GradScaler("cuda", enabled=use_amp)
 
     scheduler = select_scheduler(scheduler_name, opt, lr_sched_kwargs)
 
@@ -221,34 +454,46 @@ def train_model(
         "Training set validation label distribution: "
         f"{val_trn_ds.get_label_counts()}"
     )
-
-    LOGGER.info("Running initial validation")
-    # assess accuracy before first iteration
-    val_metrics = val_fp.validate_model(
-        model, dataset.mod_bases, criterion, val_ds, filt_frac
-    )
-    trn_metrics = val_fp.validate_model(
-        model,
-        dataset.mod_bases,
-        criterion,
-        val_trn_ds,
-        filt_frac,
-        "trn",
-    )
+    epoch_trn_ds = trn_ds
+    if is_distributed:
+        # shards are redrawn each epoch from the shared seed
+        epoch_trn_ds = trn_ds.shard(rank, world_size, seed=seed)
+        LOGGER.debug(f"Rank {rank} training on {epoch_trn_ds.nchunks} chunks")
+        # diversify shuffling and dropout across processes
+        np.random.seed(seed + rank)
+        torch.manual_seed(seed + rank)
+
+    # validation is run only by the main process
+    if is_main:
+        LOGGER.info("Running initial validation")
+        # assess accuracy before first iteration
+        val_metrics = val_fp.validate_model(
+            model, dataset.mod_bases, criterion, val_ds, filt_frac
+        )
+        trn_metrics = val_fp.validate_model(
+            model,
+            dataset.mod_bases,
+            criterion,
+            val_trn_ds,
+            filt_frac,
+            "trn",
+        )
 
     if ext_val:
         best_alt_val_accs = [0] * len(ext_sets)
-        for e_set_idx in range(len(ext_sets)):
-            val_fp.validate_model(
-                model,
-                dataset.mod_bases,
-                criterion,
-                ext_sets[e_set_idx],
-                filt_frac,
-                f"e_val_{e_set_idx}",
-            )
+        if is_main:
+            for e_set_idx in range(len(ext_sets)):
+                val_fp.validate_model(
+                    model,
+                    dataset.mod_bases,
+                    criterion,
+                    ext_sets[e_set_idx],
+                    filt_frac,
+                    f"e_val_{e_set_idx}",
+                )
 
     LOGGER.info("Start training")
+    steps_per_epoch = len(epoch_trn_ds)
     ebar = tqdm(
         total=epochs,
         smoothing=0,
@@ -256,21 +501,27 @@ def train_model(
         dynamic_ncols=True,
         position=0,
         leave=True,
+        disable=not is_main,
     )
     pbar = tqdm(
-        total=len(trn_ds),
+        total=steps_per_epoch,
         desc="Epoch Progress",
         dynamic_ncols=True,
         position=1,
         leave=True,
         bar_format="{desc}: {percentage:3.0f}%|{bar}| " "{n_fmt}/{total_fmt}",
+        disable=not is_main,
+        # throttle redraws which can slow fast training steps
+        mininterval=0.5,
+        miniters=max(1, steps_per_epoch // 200),
     )
-    ebar.set_postfix(
-        acc_val=f"{val_metrics.acc:.4f}",
-        acc_train=f"{trn_metrics.acc:.4f}",
-        loss_val=f"{val_metrics.loss:.6f}",
-        loss_train=f"{trn_metrics.loss:.6f}",
-    )
+    if is_main:
+        ebar.set_postfix(
+            acc_val=f"{val_metrics.acc:.4f}",
+            acc_train=f"{trn_metrics.acc:.4f}",
+            loss_val=f"{val_metrics.loss:.6f}",
+            loss_train=f"{trn_metrics.loss:.6f}",
+        )
     atexit.register(pbar.close)
     atexit.register(ebar.close)
 
@@ -293,141 +544,185 @@ def train_model(
         "model_version": constants.MODEL_VERSION,
         **dataset.sig_map_refiner.get_save_kwargs(),
     }
-    bb, ab = dataset.kmer_context_bases
     best_val_acc = 0
     early_stop_epochs = 0
     breached = False
+    batch_losses = []
+    # write checkpoints in the background while training continues
+    ckpt_executor = ThreadPoolExecutor(max_workers=1)
+    ckpt_futures = []
     for epoch in range(epochs):
-        model.train()
-        pbar.n = 0
-        pbar.refresh()
-        for epoch_i, ((sigs, seqs, seq_maps, seq_lens), labels, _) in enumerate(
-            trn_ds
-        ):
-            sigs = torch.from_numpy(sigs)
-            enc_kmers = torch.from_numpy(
-                encoded_kmers.compute_encoded_kmer_batch(
-                    bb, ab, seqs, seq_maps, seq_lens
-                )
+        if is_distributed and epoch > 0:
+            epoch_trn_ds = trn_ds.shard(rank, world_size, seed=seed + epoch)
+        trn_batches = BatchPrefetcher(epoch_trn_ds, prefetch_batches)
+        train_net.train()
+        # reset also clears the redraw counters used by miniters
+        pbar.reset()
+        for epoch_i, (sigs, enc_kmers, labels) in enumerate(trn_batches):
+            # accumulate gradients over accum_steps batches before stepping
+            opt_step = (epoch_i + 1) % accum_steps == 0 or (
+                epoch_i + 1 == steps_per_epoch
             )
-            labels = torch.from_numpy(labels)
-            if torch.cuda.is_available():
-                sigs = sigs.cuda()
-                enc_kmers = enc_kmers.cuda()
-                labels = labels.cuda()
-            outputs = model(sigs, enc_kmers)
-            loss = criterion(outputs, labels)
-            opt.zero_grad()
-            loss.backward()
-            opt.step()
-
-            batch_fp.write(
-                f"{(epoch * len(trn_ds)) + epoch_i}\t"
-                f"{loss.detach().cpu():.6f}\n"
+            # the final group of an epoch may contain fewer batches
+            group_start = epoch_i - (epoch_i % accum_steps)
+            group_size = min(accum_steps, steps_per_epoch - group_start)
+            # skip gradient all-reduce for batches without an optimizer step
+            sync_ctx = (
+                train_net.no_sync()
+                if is_distributed and not opt_step
+                else nullcontext()
             )
+            with sync_ctx:
+                with torch.amp.autocast("cuda", enabled=use_amp):
+                    outputs = train_net(sigs, enc_kmers)
+                    loss = criterion(outputs, labels)
+                scaler.scale(loss / group_size).backward()
+            if opt_step:
+                scaler.step(opt)
+                scaler.update()
+                opt.zero_grad(set_to_none=True)
+
+            batch_losses.append(loss.detach())
+            if len(batch_losses) >= BATCH_LOSS_BUFFER_SIZE:
+                write_batch_losses(
+                    batch_fp,
+                    batch_losses,
+                    (epoch * steps_per_epoch) + epoch_i + 1 - len(batch_losses),
+                )
             pbar.update()
-            pbar.refresh()
-
-        niter = (epoch + 1) * len(trn_ds)
-        val_metrics = val_fp.validate_model(
-            model,
-            dataset.mod_bases,
-            criterion,
-            val_ds,
-            filt_frac,
-            nepoch=epoch + 1,
-            niter=niter,
-        )
-        trn_metrics = val_fp.validate_model(
-            model,
-            dataset.mod_bases,
-            criterion,
-            val_trn_ds,
-            filt_frac,
-            "trn",
-            nepoch=epoch + 1,
-            niter=niter,
-        )
+        if len(batch_losses) > 0:
+            write_batch_losses(
+                batch_fp,
+                batch_losses,
+                ((epoch + 1) * steps_per_epoch) - len(batch_losses),
+            )
 
         scheduler.step()
 
-        if breached:
-            if val_metrics.acc <= REGRESSION_THRESHOLD:
-                LOGGER.warning("Remora training unstable")
-        else:
-            if val_metrics.acc >= BREACH_THRESHOLD:
-                breached = True
-                LOGGER.debug(
-                    f"{BREACH_THRESHOLD * 100}% accuracy threshold surpassed"
-                )
-
-        if val_metrics.acc > best_val_acc:
-            best_val_acc = val_metrics.acc
-            early_stop_epochs = 0
-            LOGGER.debug(
-                f"Saving best model after {epoch + 1} epochs with "
-                f"val_acc {val_metrics.acc}"
+        niter = (epoch + 1) * steps_per_epoch
+        if is_main:
+            # raise errors from checkpoint writes of previous epochs before
+            # training further
+            for ckpt_future in ckpt_futures:
+                ckpt_future.result()
+            ckpt_futures.clear()
+            val_metrics = val_fp.validate_model(
+                model,
+                dataset.mod_bases,
+                criterion,
+                val_ds,
+                filt_frac,
+                nepoch=epoch + 1,
+                niter=niter,
             )
-            save_model(
+            trn_metrics = val_fp.validate_model(
                 model,
-                ckpt_save_data,
-                out_path,
-                epoch,
-                opt,
+                dataset.mod_bases,
+                criterion,
+                val_trn_ds,
+                filt_frac,
+                "trn",
+                nepoch=epoch + 1,
+                niter=niter,
             )
-        else:
-            early_stop_epochs += 1
 
-        if ext_val:
-            for e_set_idx in range(len(ext_sets)):
-                e_val_metrics = val_fp.validate_model(
-                    model,
-                    dataset.mod_bases,
-                    criterion,
-                    ext_sets[e_set_idx],
-                    filt_frac,
-                    f"e_val_{e_set_idx}",
-                    nepoch=epoch + 1,
-                    niter=niter,
-                )
-                if e_val_metrics.acc <= best_alt_val_accs[e_set_idx]:
-                    continue
-                best_alt_val_accs[e_set_idx] = e_val_metrics.acc
+            if breached:
+                if val_metrics.acc <= REGRESSION_THRESHOLD:
+                    LOGGER.warning("Remora training unstable")
+            else:
+                if val_metrics.acc >= BREACH_THRESHOLD:
+                    breached = True
+                    LOGGER.debug(
+                        f"{BREACH_THRESHOLD * 100}% accuracy threshold "
+                        "surpassed"
+                    )
+
+            if val_metrics.acc > best_val_acc:
+                best_val_acc = val_metrics.acc
                 early_stop_epochs = 0
                 LOGGER.debug(
-                    f"Saving best model based on e_val_{e_set_idx} "
-                    f"validation sets after {epoch + 1} epochs "
-                    f"with val_acc {e_val_metrics.acc}"
+                    f"Saving best model after {epoch + 1} epochs with "
+                    f"val_acc {val_metrics.acc}"
                 )
-                save_model(
-                    model,
-                    ckpt_save_data,
-                    out_path,
-                    epoch,
-                    opt,
-                    model_name=f"model_e_val_{e_set_idx}_best.checkpoint",
-                    model_name_torchscript=f"model_e_val_{e_set_idx}_best.pt",
+                ckpt_futures.append(
+                    save_model(
+                        model,
+                        ckpt_save_data,
+                        out_path,
+                        epoch,
+                        opt,
+                        executor=ckpt_executor,
+                    )
+                )
+            else:
+                early_stop_epochs += 1
+
+            if ext_val:
+                for e_set_idx in range(len(ext_sets)):
+                    e_val_metrics = val_fp.validate_model(
+                        model,
+                        dataset.mod_bases,
+                        criterion,
+                        ext_sets[e_set_idx],
+                        filt_frac,
+                        f"e_val_{e_set_idx}",
+                        nepoch=epoch + 1,
+                        niter=niter,
+                    )
+                    if e_val_metrics.acc <= best_alt_val_accs[e_set_idx]:
+                        continue
+                    best_alt_val_accs[e_set_idx] = e_val_metrics.acc
+                    early_stop_epochs = 0
+                    LOGGER.debug(
+                        f"Saving best model based on e_val_{e_set_idx} "
+                        f"validation sets after {epoch + 1} epochs "
+                        f"with val_acc {e_val_metrics.acc}"
+                    )
+                    ckpt_futures.append(
+                        save_model(
+                            model,
+                            ckpt_save_data,
+                            out_path,
+                            epoch,
+                            opt,
+                            model_name=(
+                                f"model_e_val_{e_set_idx}_best.checkpoint"
+                            ),
+                            model_name_torchscript=(
+                                f"model_e_val_{e_set_idx}_best.pt"
+                            ),
+                            executor=ckpt_executor,
+                        )
+                    )
+
+            if int(epoch + 1) % save_freq == 0:
+                ckpt_futures.append(
+                    save_model(
+                        model,
+                        ckpt_save_data,
+                        out_path,
+                        epoch,
+                        opt,
+                        model_name=f"model_{epoch + 1:06d}.checkpoint",
+                        model_name_torchscript=f"model_{epoch + 1:06d}.pt",
+                        executor=ckpt_executor,
+                    )
                 )
 
-        if int(epoch + 1) % save_freq == 0:
-            save_model(
-                model,
-                ckpt_save_data,
-                out_path,
-                epoch,
-                opt,
-                model_name=f"model_{epoch + 1:06d}.checkpoint",
-                model_name_torchscript=f"model_{epoch + 1:06d}.pt",
+            ebar.set_postfix(
+                acc_val=f"{val_metrics.acc:.4f}",
+                acc_train=f"{trn_metrics.acc:.4f}",
+                loss_val=f"{val_metrics.loss:.6f}",
+                loss_train=f"{trn_metrics.loss:.6f}",
             )
-
-        ebar.set_postfix(
-            acc_val=f"{val_metrics.acc:.4f}",
-            acc_train=f"{trn_metrics.acc:.4f}",
-            loss_val=f"{val_metrics.loss:.6f}",
-            loss_train=f"{trn_metrics.loss:.6f}",
-        )
         ebar.update()
-        if early_stopping and early_stop_epochs >= early_stopping:
+        stop_early = early_stopping and early_stop_epochs >= early_stopping
+        if is_distributed:
+            # follow the main process so all processes stop together
+            stop_list = [stop_early]
+            dist.broadcast_object_list(stop_list, src=0)
+            stop_early = stop_list[0]
+        if stop_early:
             LOGGER.info(
                 "No validation accuracy improvement after"
                 f" {early_stopping} epoch(s). Stopping training early."
@@ -435,16 +730,23 @@ def train_model(
             break
     ebar.close()
     pbar.close()
-    LOGGER.info("Saving final model checkpoint")
-    save_model(
-        model,
-        ckpt_save_data,
-        out_path,
-        epoch,
-        opt,
-        model_name=constants.FINAL_MODEL_FILENAME,
-        model_name_torchscript=constants.FINAL_TORCHSCRIPT_MODEL_FILENAME,
-    )
+    # wait for background checkpoint writes and raise any errors
+    for ckpt_future in ckpt_futures:
+        ckpt_future.result()
+    ckpt_executor.shutdown(wait=True)
+    if is_main:
+        LOGGER.info("Saving final model checkpoint")
+        save_model(
+            model,
+            ckpt_save_data,
+            out_path,
+            epoch,
+            opt,
+            model_name=constants.FINAL_MODEL_FILENAME,
+            model_name_torchscript=constants.FINAL_TORCHSCRIPT_MODEL_FILENAME,
+        )
+    if dist.is_initialized():
+        dist.destroy_process_group()
     LOGGER.info("Training complete")
 
 
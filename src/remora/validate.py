@@ -117,7 +117,6 @@ def _validate_model(
     is_torch_model = isinstance(model, nn.Module)
     if is_torch_model:
         model.eval()
-        torch.set_grad_enabled(False)
 
     bb, ab = dataset.kmer_context_bases
     all_labels = []
@@ -128,37 +127,38 @@ def _validate_model(
         if display_progress_bar
         else dataset
     )
-    for (
-        (sigs, seqs, seq_maps, seq_lens),
-        labels,
-        (read_ids, read_focus_bases),
-    ) in ds_iter:
-        all_labels.append(labels)
-        enc_kmers = encoded_kmers.compute_encoded_kmer_batch(
-            bb, ab, seqs, seq_maps, seq_lens
-        )
-        if is_torch_model:
-            sigs = torch.from_numpy(sigs).to(device)
-            enc_kmers = torch.from_numpy(enc_kmers).to(device)
-            output = model(sigs, enc_kmers).detach().cpu().numpy()
-        else:
-            output = model.run([], {"sig": sigs, "seq": enc_kmers})[0]
-        output = add_unmodeled_labels(output, unmodeled_labels)
-        all_outputs.append(output)
-        all_loss.append(
-            criterion(torch.from_numpy(output), torch.from_numpy(labels))
-            .detach()
-            .cpu()
-            .numpy()
-        )
-        if full_results_fh is not None:
-            full_results_fh.write_results(
-                output, labels, read_ids, read_focus_bases
+    # inference mode disables autograd tracking entirely
+    with torch.inference_mode():
+        for (
+            (sigs, seqs, seq_maps, seq_lens),
+            labels,
+            (read_ids, read_focus_bases),
+        ) in ds_iter:
+            all_labels.append(labels)
+            enc_kmers = encoded_kmers.compute_encoded_kmer_batch(
+                bb, ab, seqs, seq_maps, seq_lens
             )
+            if is_torch_model:
+                sigs = torch.from_numpy(sigs).to(device)
+                enc_kmers = torch.from_numpy(enc_kmers).to(device)
+                with torch.amp.autocast("cuda", enabled=device.type == "cuda"):
+                    output = model(sigs, enc_kmers)
+                output = output.float().cpu().numpy()
+            else:
+                output = model.run([], {"sig": sigs, "seq": enc_kmers})[0]
+            output = add_unmodeled_labels(output, unmodeled_labels)
+            all_outputs.append(output)
+            all_loss.append(
+                criterion(torch.from_numpy(output), torch.from_numpy(labels))
+                .cpu()
+                .numpy()
+            )
+            if full_results_fh is not None:
+                full_results_fh.write_results(
+                    output, labels, read_ids, read_focus_bases
+                )
     all_outputs = np.concatenate(all_outputs, axis=0)
     all_labels = np.concatenate(all_labels)
-    if is_torch_model:
-        torch.set_grad_enabled(True)
     all_probs = softmax_axis1(all_outputs)
     acc, conf_mat, filt_frac, filt_acc, filt_conf_mat = compute_metrics(
         all_probs, all_labels, filt_frac
@@ -1,13 +1,18 @@
 """ Test main module.
 """
+import os
 from pathlib import Path
-from subprocess import check_call
+from subprocess import check_call, CalledProcessError
+from concurrent.futures import ThreadPoolExecutor
 
 import pysam
 import pytest
+import torch
+import numpy as np
 
 from remora.data_chunks import RemoraDataset
-from remora import io
+from remora.train_model import BatchPrefetcher, save_model
+from remora import io, RemoraError
 
 pytestmark = pytest.mark.main
 
@@ -68,6 +73,113 @@ def test_remora_dataset(chunks):
     assert dict(dataset.get_label_counts()) == {1: 75, 0: 75}
 
 
+@pytest.mark.unit
+@pytest.mark.etl
+def test_remora_dataset_shard(chunks):
+    dataset = RemoraDataset.load_from_file(
+        str(chunks),
+        batch_size=10,
+        balanced_batch=False,
+    )
+    chunk_ids = set(zip(dataset.read_ids, dataset.read_focus_bases))
+    assert len(chunk_ids) == dataset.nchunks
+    for seed in (None, 1):
+        shards = [dataset.shard(rank, 4, seed=seed) for rank in range(4)]
+        assert all(shard.nchunks == 37 for shard in shards)
+        shard_ids = [
+            set(zip(shard.read_ids, shard.read_focus_bases)) for shard in shards
+        ]
+        assert len(set.union(*shard_ids)) == 4 * 37
+        assert set.union(*shard_ids).issubset(chunk_ids)
+    # different seeds draw different shards
+    assert not np.array_equal(
+        dataset.shard(0, 4, seed=1).read_ids,
+        dataset.shard(0, 4, seed=2).read_ids,
+    )
+    with pytest.raises(RemoraError):
+        dataset.shard(0, dataset.nchunks + 1)
+
+
+@pytest.mark.unit
+def test_batch_prefetcher(chunks):
+    dataset = RemoraDataset.load_from_file(
+        str(chunks),
+        batch_size=10,
+        shuffle_on_iter=False,
+        drop_last=False,
+    )
+    direct_batches = list(BatchPrefetcher(dataset, prefetch_batches=0))
+    prefetch_batches = list(BatchPrefetcher(dataset, prefetch_batches=4))
+    assert len(direct_batches) == len(dataset)
+    assert len(prefetch_batches) == len(dataset)
+    for direct_batch, prefetch_batch in zip(direct_batches, prefetch_batches):
+        assert all(map(torch.equal, direct_batch, prefetch_batch))
+
+
+class FailingDataset:
+    """Wrap a dataset to raise an error part way through iteration"""
+
+    def __init__(self, dataset, nbatches):
+        self.dataset = dataset
+        self.nbatches = nbatches
+        self.kmer_context_bases = dataset.kmer_context_bases
+
+    def __iter__(self):
+        for batch_i, batch in enumerate(self.dataset):
+            if batch_i == self.nbatches:
+                raise ValueError("Failed to load batch")
+            yield batch
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch_batches", [0, 4])
+def test_batch_prefetcher_error(chunks, prefetch_batches):
+    dataset = RemoraDataset.load_from_file(str(chunks), batch_size=10)
+    nbatches = 0
+    with pytest.raises(ValueError, match="Failed to load batch"):
+        for _ in BatchPrefetcher(
+            FailingDataset(dataset, 3), prefetch_batches=prefetch_batches
+        ):
+            nbatches += 1
+    # the next batch is loaded before the current batch is yielded
+    assert nbatches == 2
+
+
+@pytest.mark.unit
+def test_save_model_error(tmpdir_factory):
+    model = torch.nn.Linear(4, 2)
+    opt = torch.optim.SGD(model.parameters(), lr=0.1)
+    out_dir = tmpdir_factory.mktemp("remora_tests") / "missing_dir"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        ckpt_future = save_model(
+            model, {}, out_dir, 0, opt, as_torchscript=False, executor=executor
+        )
+        with pytest.raises(RuntimeError):
+            ckpt_future.result()
+
+
+@pytest.mark.unit
+def test_train_negative_prefetch(tmpdir_factory, chunks, train_cli_args):
+    out_dir = tmpdir_factory.mktemp("remora_tests") / "train_bad_prefetch"
+    with pytest.raises(CalledProcessError):
+        check_call(
+            [
+                "remora",
+                "model",
+                "train",
+                str(chunks),
+                "--output-path",
+                str(out_dir),
+                "--model",
+                MODELS_DIR / "ConvLSTM_w_ref.py",
+                "--prefetch-batches",
+                "-1",
+                *train_cli_args,
+            ],
+        )
+    assert not out_dir.exists()
+
+
 ##################
 # Mod Prediction #
 ##################
@@ -96,6 +208,81 @@ def test_train(model_path, tmpdir_factory, chunks, train_cli_args):
     return out_dir
 
 
+@pytest.mark.unit
+def test_train_accum_steps(tmpdir_factory, chunks, train_cli_args):
+    """Run `model train` accumulating gradients over several batches. The
+    last accumulation group of each epoch is smaller than the others.
+    """
+    out_dir = tmpdir_factory.mktemp("remora_tests") / "train_accum_model"
+    print(f"Output file: {out_dir}")
+    check_call(
+        [
+            "remora",
+            "model",
+            "train",
+            str(chunks),
+            "--output-path",
+            str(out_dir),
+            "--model",
+            MODELS_DIR / "ConvLSTM_w_ref.py",
+            "--accum-steps",
+            "3",
+            *train_cli_args,
+        ],
+    )
+    assert (out_dir / FINAL_MODEL_FILENAME).exists()
+
+
+@pytest.mark.unit
+def test_train_invalid_accum_steps(tmpdir_factory, chunks, train_cli_args):
+    out_dir = tmpdir_factory.mktemp("remora_tests") / "train_bad_accum"
+    with pytest.raises(CalledProcessError):
+        check_call(
+            [
+                "remora",
+                "model",
+                "train",
+                str(chunks),
+                "--output-path",
+                str(out_dir),
+                "--model",
+                MODELS_DIR / "ConvLSTM_w_ref.py",
+                "--accum-steps",
+                "0",
+                *train_cli_args,
+            ],
+        )
+    assert not out_dir.exists()
+
+
+@pytest.mark.unit
+def test_train_distributed(tmpdir_factory, chunks, train_cli_args):
+    """Run `model train` in two processes with torchrun on the CPU."""
+    out_dir = tmpdir_factory.mktemp("remora_tests") / "train_dist_model"
+    print(f"Output file: {out_dir}")
+    check_call(
+        [
+            "torchrun",
+            "--standalone",
+            "--nproc_per_node",
+            "2",
+            "-m",
+            "remora.main",
+            "model",
+            "train",
+            str(chunks),
+            "--output-path",
+            str(out_dir),
+            "--model",
+            MODELS_DIR / "ConvLSTM_w_ref.py",
+            *train_cli_args,
+        ],
+        # hide GPUs to use the gloo backend
+        env={**os.environ, "CUDA_VISIBLE_DEVICES": ""},
+    )
+    assert (out_dir / FINAL_MODEL_FILENAME).exists()
+
+
 @pytest.mark.unit
 def test_mod_infer(tmpdir_factory, can_pod5, can_mappings, fw_mod_model_dir):
     out_dir = tmpdir_factory.mktemp("remora_tests")